@@ -1,12 +1,28 @@
+import importlib.util
+import numpy as np
 import pygame
 import random
 import sys
+import threading
 import time
+from collections import deque
+from functools import lru_cache
 
 # Define constants
 CELL_SIZE = 30
 PANEL_HEIGHT = 100
-FPS = 30
+TIMER_EVENT = pygame.USEREVENT + 1  # Posted once a second to update the timer
+
+# (row, col) offsets of the eight cells around a cell
+NEIGHBOR_OFFSETS = ((-1, -1), (-1, 0), (-1, 1), (0, -1), (0, 1), (1, -1), (1, 0), (1, 1))
+
+# Boards with at least this many cells use the compiled kernels when numba is
+# installed (the optional "jit" extra). numba itself is only imported when needed
+JIT_AVAILABLE = importlib.util.find_spec("numba") is not None
+JIT_MIN_CELLS = 2500
+
+# Boards with at most this many cells count neighbors on a bitboard held in one int
+BITBOARD_MAX_CELLS = 64
 
 # Colors
 WHITE = (255, 255, 255)
@@ -24,85 +40,303 @@ pygame.init()
 FONT = pygame.font.Font(None, 36)
 SMALL_FONT = pygame.font.Font(None, 28)
 
+# Sprite keys of revealed safe cells, indexed by their number of neighboring mines
+REVEALED_STATES = tuple(f"revealed_{n}" for n in range(9))
+
+
+def cell_state_key(is_revealed, is_mine, is_flagged, neighbor_mines):
+    """Gets the key of the surface a cell is drawn with from its state
+
+    Args:
+        is_revealed (_int_): Whether the cell is revealed
+        is_mine (_int_): Whether the cell is a mine
+        is_flagged (_int_): Whether the cell is flagged
+        neighbor_mines (_int_): Number of mines around the cell
+
+    Returns:
+        string state: Key into the cell sprites
+    """
+    if is_revealed:
+        return "mine" if is_mine else REVEALED_STATES[neighbor_mines]
+    if is_flagged:
+        return "flag"
+    return "hidden"
+
+
+# Glyphs drawn on cells, rendered once instead of every frame
+GLYPHS = {str(n): FONT.render(str(n), True, BLACK) for n in range(1, 9)}
+GLYPHS["M"] = FONT.render("M", True, BLACK)
+GLYPHS["F"] = FONT.render("F", True, BLACK)
+
+
+def make_cell_surface(color, glyph=None):
+    """Pre-renders a cell with its background, glyph and border
+
+    Args:
+        color (_tuple_): Background color of the cell
+        glyph (_string_, optional): Key into GLYPHS drawn on the cell. Defaults to None.
+
+    Returns:
+        pygame.Surface: Surface the size of one cell
+    """
+    surface = pygame.Surface((CELL_SIZE, CELL_SIZE))
+    surface.fill(color)
+    if glyph is not None:
+        surface.blit(GLYPHS[glyph], (10, 5))
+    pygame.draw.rect(surface, BLACK, surface.get_rect(), 1)
+    return surface
+
+
+def build_cell_sprites():
+    """Pre-renders one opaque surface per cell state, in the pixel format of the display
+
+    Needs the display mode to be set, and has to be called again whenever it changes.
+
+    Returns:
+        dict sprites: Surfaces keyed like Board.cell_state
+    """
+    sprites = {
+        "hidden": make_cell_surface(DARK_GRAY),
+        "flag": make_cell_surface(YELLOW, "F"),
+        "mine": make_cell_surface(RED, "M"),
+        REVEALED_STATES[0]: make_cell_surface(GRAY),
+    }
+    for n in range(1, 9):
+        sprites[REVEALED_STATES[n]] = make_cell_surface(GRAY, str(n))
+    return {state: surface.convert() for state, surface in sprites.items()}
+
+
+def build_background(rows, cols):
+    """Pre-renders the panel and the grid of unrevealed cells of a new game
+
+    Needs the display mode to be set.
+
+    Args:
+        rows (_int_): Number of rows
+        cols (_int_): Number of columns
+
+    Returns:
+        pygame.Surface: Surface the size of the game window
+    """
+    width, height = cols * CELL_SIZE, rows * CELL_SIZE + PANEL_HEIGHT
+    background = pygame.Surface((width, height)).convert()
+    background.fill(GRAY, (0, 0, width, PANEL_HEIGHT))
+    background.fill(DARK_GRAY, (0, PANEL_HEIGHT, width, height - PANEL_HEIGHT))
+    # Every cell has a 1px border, so each grid line is two pixels wide between cells
+    for c in range(cols):
+        for x in (c * CELL_SIZE, c * CELL_SIZE + CELL_SIZE - 1):
+            pygame.draw.line(background, BLACK, (x, PANEL_HEIGHT), (x, height - 1))
+    for r in range(rows):
+        for y in (PANEL_HEIGHT + r * CELL_SIZE, PANEL_HEIGHT + r * CELL_SIZE + CELL_SIZE - 1):
+            pygame.draw.line(background, BLACK, (0, y), (width - 1, y))
+    return background
+
+
+# Template of the board drawing function, specialized for one board shape by
+# build_draw_board. Sprites are picked with cell_state_key, like Board.cell_state.
+DRAW_BOARD_SOURCE = """
+def draw_board(board, screen, sprites):
+    dirty_cells = board.dirty_cells
+    if not dirty_cells:
+        return []
+    is_revealed = board.is_revealed.reshape(-1)
+    is_mine = board.is_mine.reshape(-1)
+    is_flagged = board.is_flagged.reshape(-1)
+    neighbor_mines = board.neighbor_mines.reshape(-1)
+    blit_sequence = []
+    for k in dirty_cells:
+        state = cell_state_key(is_revealed[k], is_mine[k], is_flagged[k], neighbor_mines[k])
+        blit_sequence.append((sprites[state], POSITIONS[k]))
+    screen.blits(blit_sequence, doreturn=False)
+    dirty_rows = [k // {cols} for k in dirty_cells]
+    dirty_cols = [k % {cols} for k in dirty_cells]
+    top, left = min(dirty_rows), min(dirty_cols)
+    dirty_cells.clear()
+    return [Rect(left * {cell_size}, top * {cell_size} + {panel_height},
+                 (max(dirty_cols) - left + 1) * {cell_size}, (max(dirty_rows) - top + 1) * {cell_size})]
+"""
+
+
+@lru_cache(maxsize=1)
+def build_draw_board(rows, cols):
+    """Generates the board drawing function for one board shape
+
+    The number of columns and the cell geometry are written into the source
+    as literals, and the screen position of every cell is computed once.
+    Only the latest shape is cached, since a new game usually keeps the size.
+
+    Args:
+        rows (_int_): Number of rows
+        cols (_int_): Number of columns
+
+    Returns:
+        function draw_board: Takes the board, the screen and the cell sprites,
+        and returns the redrawn area like Board.draw
+    """
+    source = DRAW_BOARD_SOURCE.format(cols=cols, cell_size=CELL_SIZE, panel_height=PANEL_HEIGHT)
+    namespace = {
+        "Rect": pygame.Rect,
+        "POSITIONS": tuple((c * CELL_SIZE, r * CELL_SIZE + PANEL_HEIGHT) for r in range(rows) for c in range(cols)),
+        "cell_state_key": cell_state_key,
+    }
+    exec(source, namespace)
+    return namespace["draw_board"]
+
+
+# Board kernels working directly on the arrays of a Board
+
+def flood_reveal_nb(is_revealed, is_flagged, neighbor_mines, start_r, start_c, out_changed):
+    """Array version of Board.flood_reveal, compiled with numba when available
+
+    Args:
+        is_revealed (_ndarray_): Revealed state of the board, updated in place
+        is_flagged (_ndarray_): Flagged state of the board
+        neighbor_mines (_ndarray_): Neighbor mine counts of the board
+        start_r (_int_): Row of the cell the flood starts from
+        start_c (_int_): Column of the cell the flood starts from
+        out_changed (_ndarray_): Buffer of at least rows * cols ints, doubling as the queue
+
+    Returns:
+        integer count: Number of revealed cells, whose flat indexes start out_changed
+    """
+    rows, cols = is_revealed.shape
+    is_revealed[start_r, start_c] = 1
+    out_changed[0] = start_r * cols + start_c
+    head = 0
+    tail = 1
+    while head < tail:
+        row, col = divmod(out_changed[head], cols)
+        head += 1
+        if neighbor_mines[row, col] > 0:
+            continue
+        for dr, dc in NEIGHBOR_OFFSETS:
+            r, c = row + dr, col + dc
+            if 0 <= r < rows and 0 <= c < cols and not is_revealed[r, c] and not is_flagged[r, c]:
+                is_revealed[r, c] = 1
+                out_changed[tail] = r * cols + c
+                tail += 1
+    return tail
+
+
+def count_neighbors_nb(mask, out):
+    """Array version of Board.calculate_neighbor_mines, compiled with numba when available
+
+    Args:
+        mask (_ndarray_): 1 where there is a mine
+        out (_ndarray_): Array of the same shape receiving the counts, 0 on mines
+    """
+    rows, cols = mask.shape
+    for row in range(rows):
+        for col in range(cols):
+            count = 0
+            if not mask[row, col]:
+                for dr, dc in NEIGHBOR_OFFSETS:
+                    r, c = row + dr, col + dc
+                    if 0 <= r < rows and 0 <= c < cols:
+                        count += mask[r, c]
+            out[row, col] = count
+
+
+@lru_cache(maxsize=None)
+def neighbor_bits(rows, cols):
+    """Builds the bitboard masks of the cells around each cell
+
+    Args:
+        rows (_int_): Number of rows
+        cols (_int_): Number of columns
+
+    Returns:
+        tuple masks: For each flat index, an int with the bits of its neighbors set
+    """
+    masks = []
+    for k in range(rows * cols):
+        row, col = divmod(k, cols)
+        bits = 0
+        for dr, dc in NEIGHBOR_OFFSETS:
+            r, c = row + dr, col + dc
+            if 0 <= r < rows and 0 <= c < cols:
+                bits |= 1 << (r * cols + c)
+        masks.append(bits)
+    return tuple(masks)
+
+
+# Compiled versions of the kernels, filled in by compile_jit_kernels
+jit_kernels = {}
+jit_lock = threading.Lock()
+
+
+def compile_jit_kernels():
+    """Imports numba and compiles the board kernels
+
+    Game.start_game runs this in a background thread for large boards, so the
+    board keeps using the Python and NumPy paths until the kernels are ready
+    instead of freezing on the first click.
+    """
+    with jit_lock:
+        if jit_kernels:
+            return
+        from numba import njit
+        flood_reveal = njit(cache=True)(flood_reveal_nb)
+        count_neighbors = njit(cache=True)(count_neighbors_nb)
+        # Call both once on a tiny board, which is when numba compiles them
+        mask = np.zeros((3, 3), dtype=np.uint8)
+        count_neighbors(mask, np.zeros_like(mask))
+        flood_reveal(np.zeros_like(mask), mask, mask, 1, 1, np.empty(9, dtype=np.int32))
+        jit_kernels.update(flood_reveal=flood_reveal, count_neighbors=count_neighbors)
+
+
 class Cell:
-    def __init__(self, row, col):
-        """Initializes each cell
+    def __init__(self, board, row, col):
+        """Creates a read-only view of a single cell, whose state lives in the board arrays
+
+        The state is changed through the Board (or reveal and toggle_flag here),
+        which keeps the count of unrevealed safe cells and the redraw set in step.
 
         Args:
+            board (_Board_): Board holding the state of the cell
             row (_int_): Row of cell
             col (_int_): Column of cell
         """
+        self.board = board
         self.row = row
         self.col = col
-        self.is_mine = False
-        self.is_revealed = False
-        self.is_flagged = False
-        self.neighbor_mines = 0
-        self.rect = pygame.Rect(col * CELL_SIZE, row * CELL_SIZE + PANEL_HEIGHT, CELL_SIZE, CELL_SIZE)
 
-    def draw(self, screen):
-        """Draws the gameboard
+    @property
+    def is_mine(self):
+        return bool(self.board.is_mine[self.row, self.col])
 
-        Args:
-            screen (_attr_): Attribute of the Game class referring to the display
-        """
-        if self.is_revealed:
-            if self.is_mine:
-                pygame.draw.rect(screen, RED, self.rect)
-                text = FONT.render("M", True, BLACK)
-                screen.blit(text, (self.rect.x + 10, self.rect.y + 5))
-            else:
-                pygame.draw.rect(screen, GRAY, self.rect)
-                if self.neighbor_mines > 0:
-                    text = FONT.render(str(self.neighbor_mines), True, BLACK)
-                    screen.blit(text, (self.rect.x + 10, self.rect.y + 5))
-        else:
-            pygame.draw.rect(screen, DARK_GRAY, self.rect)
-            if self.is_flagged:
-                pygame.draw.rect(screen, YELLOW, self.rect)
-                text = FONT.render("F", True, BLACK)
-                screen.blit(text, (self.rect.x + 10, self.rect.y + 5))
-        pygame.draw.rect(screen, BLACK, self.rect, 1)
+    @property
+    def is_revealed(self):
+        return bool(self.board.is_revealed[self.row, self.col])
 
-    def reveal(self, board):
-        """Handles revealing mines
+    @property
+    def is_flagged(self):
+        return bool(self.board.is_flagged[self.row, self.col])
 
-        Args:
-            board (_attr_): Attribute of the Game class referring to the game board
+    @property
+    def neighbor_mines(self):
+        return int(self.board.neighbor_mines[self.row, self.col])
+
+    def reveal(self):
+        """Handles revealing the cell
 
         Returns:
             Boolean True/False: Whether a mine is revealed (Ending the game) or not
         """
-        if self.is_flagged or self.is_revealed:
-            return
-        self.is_revealed = True
-        if self.is_mine:
-            return True  # Game over
-        if self.neighbor_mines == 0:
-            self.reveal_neighbors(board)
-        return False
-
-    def reveal_neighbors(self, board):
-        """Handles revealing a cell's neighbors if the cell has no neighboring mines
-
-        Args:
-            board (_attr_): Attribute of the Game class referring to the game board
-        """
-        for r in range(max(0, self.row - 1), min(board.rows, self.row + 2)):
-            for c in range(max(0, self.col - 1), min(board.cols, self.col + 2)):
-                if not board.cells[r][c].is_revealed:
-                    board.cells[r][c].reveal(board)
+        return self.board.reveal(self.row, self.col)
 
     def toggle_flag(self):
-        """Handles flagging or unflagging cells
+        """Handles flagging or unflagging the cell
         """
-        if not self.is_revealed:
-            self.is_flagged = not self.is_flagged
+        self.board.toggle_flag(self.row, self.col)
 
 class Board:
     def __init__(self, rows, cols, mines):
         """Establishes the game board
 
+        The state of the cells is kept as one uint8 array per attribute
+        (structure of arrays) rather than one object per cell.
+
         Args:
             rows (_int_): Number of rows
             cols (_int_): Number of columns
@@ -111,9 +345,104 @@ class Board:
         self.rows = rows
         self.cols = cols
         self.mines = mines
-        self.cells = [[Cell(r, c) for c in range(cols)] for r in range(rows)]
+        self.is_mine = np.zeros((rows, cols), dtype=np.uint8)
+        self.is_revealed = np.zeros((rows, cols), dtype=np.uint8)
+        self.is_flagged = np.zeros((rows, cols), dtype=np.uint8)
+        self.neighbor_mines = np.zeros((rows, cols), dtype=np.uint8)
         self.mine_locations = []
         self.first_click = True
+        self.unrevealed_safe = rows * cols - mines  # The game is won once this reaches 0
+        self.use_jit = JIT_AVAILABLE and rows * cols >= JIT_MIN_CELLS
+        self.use_bitboard = rows * cols <= BITBOARD_MAX_CELLS
+        self.draw_board = build_draw_board(rows, cols)
+        # Flat indexes (row * cols + col) of the cells whose look changed since
+        # the last draw. New boards look like the background, so none to begin with
+        self.dirty_cells = set()
+
+    def cell(self, row, col):
+        """Returns a view of a single cell
+
+        Args:
+            row (_int_): Row of cell
+            col (_int_): Column of cell
+
+        Returns:
+            Cell: Read-only view of the board arrays
+        """
+        return Cell(self, row, col)
+
+    def reveal(self, row, col):
+        """Handles revealing a cell
+
+        Args:
+            row (_int_): Row of cell
+            col (_int_): Column of cell
+
+        Returns:
+            Boolean True/False: Whether a mine is revealed (Ending the game) or not
+        """
+        if self.is_flagged[row, col] or self.is_revealed[row, col]:
+            return False
+        if self.is_mine[row, col]:
+            self.is_revealed[row, col] = 1
+            self.dirty_cells.add(row * self.cols + col)
+            return True  # Game over
+        self.flood_reveal(row, col)
+        return False
+
+    def toggle_flag(self, row, col):
+        """Handles flagging or unflagging a cell
+
+        Args:
+            row (_int_): Row of cell
+            col (_int_): Column of cell
+        """
+        if not self.is_revealed[row, col]:
+            self.is_flagged[row, col] ^= 1
+            self.dirty_cells.add(row * self.cols + col)
+
+    def flood_reveal(self, start_r, start_c):
+        """Reveals the region connected to a cell with no neighboring mines
+
+        Args:
+            start_r (_int_): Row of the cell the flood starts from
+            start_c (_int_): Column of the cell the flood starts from
+        """
+        rows, cols = self.rows, self.cols
+        if self.use_jit and jit_kernels:
+            changed = np.empty(rows * cols, dtype=np.int32)
+            revealed = jit_kernels["flood_reveal"](self.is_revealed, self.is_flagged, self.neighbor_mines,
+                                       start_r, start_c, changed)
+            self.dirty_cells.update(changed[:revealed].tolist())
+            self.unrevealed_safe -= revealed
+            return
+        # Flat views of the board, indexed with row * cols + col
+        is_revealed = self.is_revealed.reshape(-1)
+        is_flagged = self.is_flagged.reshape(-1)
+        neighbor_mines = self.neighbor_mines.reshape(-1)
+        dirty_cells = self.dirty_cells
+        start = start_r * cols + start_c
+        is_revealed[start] = 1
+        dirty_cells.add(start)
+        revealed = 1
+        queue = deque([start])
+        while queue:
+            k = queue.popleft()
+            if neighbor_mines[k] > 0:
+                continue
+            row, col = divmod(k, cols)
+            for dr, dc in NEIGHBOR_OFFSETS:
+                r, c = row + dr, col + dc
+                if 0 <= r < rows and 0 <= c < cols:
+                    n = r * cols + c
+                    if not is_revealed[n] and not is_flagged[n]:
+                        # Mark on enqueue so each cell is visited once
+                        is_revealed[n] = 1
+                        dirty_cells.add(n)
+                        revealed += 1
+                        queue.append(n)
+        # Only cells with no neighboring mines spread the flood, so no mine is revealed here
+        self.unrevealed_safe -= revealed
 
     def place_mines(self, exclude_row, exclude_col):
         """Places all mines at the first click
@@ -122,26 +451,52 @@ class Board:
             exclude_row (_int_): Row of first click, to have no mines on or around it
             exclude_col (_int_): Column of first click, to have no mines on or around it
         """
-        # Ensure no mines around the first clicked cell and its neighbors
-        exclude_positions = [(r, c) for r in range(max(0, exclude_row - 1), min(self.rows, exclude_row + 2))
-                             for c in range(max(0, exclude_col - 1), min(self.cols, exclude_col + 2))]
-        
-        available_positions = [(r, c) for r in range(self.rows) for c in range(self.cols)
-                               if (r, c) not in exclude_positions]
-        self.mine_locations = random.sample(available_positions, self.mines)
-        
-        for (r, c) in self.mine_locations:
-            self.cells[r][c].is_mine = True
+        rows, cols = self.rows, self.cols
+        total = rows * cols
+        # Ensure no mines around the first clicked cell and its neighbors,
+        # working with flat indexes r * cols + c
+        exclude = {exclude_row * cols + exclude_col}
+        for dr, dc in NEIGHBOR_OFFSETS:
+            r, c = exclude_row + dr, exclude_col + dc
+            if 0 <= r < rows and 0 <= c < cols:
+                exclude.add(r * cols + c)
+
+        if self.mines * 2 <= total - len(exclude):
+            # Rejection sampling, most draws land on an allowed cell
+            chosen = set()
+            while len(chosen) < self.mines:
+                k = random.randrange(total)
+                if k not in exclude:
+                    chosen.add(k)
+        else:
+            # Dense boards would reject too often, so sample the allowed cells directly
+            chosen = random.sample([k for k in range(total) if k not in exclude], self.mines)
+        self.mine_locations = [divmod(k, cols) for k in chosen]
+
+        self.is_mine.reshape(-1)[list(chosen)] = 1
         
         self.calculate_neighbor_mines()
 
     def calculate_neighbor_mines(self):
-        """Loops a function counting mines around a cell
+        """Counts the mines around every cell at once from the mine array
         """
-        for row in range(self.rows):
-            for col in range(self.cols):
-                if not self.cells[row][col].is_mine:
-                    self.cells[row][col].neighbor_mines = self.count_mines_around(row, col)
+        rows, cols = self.rows, self.cols
+        mask = self.is_mine
+        if self.use_jit and jit_kernels:
+            jit_kernels["count_neighbors"](mask, self.neighbor_mines)
+            return
+        if self.use_bitboard:
+            # Bit k of mine_bits is set when the cell at flat index k is a mine
+            mine_bits = int.from_bytes(np.packbits(mask, axis=None, bitorder="little").tobytes(), "little")
+            counts = [0 if mine_bits >> k & 1 else (mine_bits & bits).bit_count()
+                      for k, bits in enumerate(neighbor_bits(rows, cols))]
+            self.neighbor_mines = np.array(counts, dtype=np.uint8).reshape(rows, cols)
+            return
+        padded = np.pad(mask, 1)
+        # Sum the nine shifted views of the mask, i.e. a 3x3 convolution
+        counts = sum(padded[i:i + rows, j:j + cols] for i in range(3) for j in range(3))
+        counts[mask == 1] = 0  # Mines keep a count of 0
+        self.neighbor_mines = counts
 
     def count_mines_around(self, row, col):
         """Counts the mines around a cell
@@ -153,28 +508,39 @@ class Board:
         Returns:
             integer count: Number of mines around a cell
         """
-        count = 0
-        for r in range(max(0, row - 1), min(self.rows, row + 2)):
-            for c in range(max(0, col - 1), min(self.cols, col + 2)):
-                if self.cells[r][c].is_mine:
-                    count += 1
-        return count
+        return int(self.is_mine[max(0, row - 1):row + 2, max(0, col - 1):col + 2].sum())
 
-    def draw(self, screen):
-        """Draws the game board
+    def cell_state(self, row, col):
+        """Gets the key of the surface a cell is drawn with
+
+        Args:
+            row (_int_): Row of cell
+            col (_int_): Column of cell
+
+        Returns:
+            string state: Key into the cell sprites
+        """
+        return cell_state_key(self.is_revealed[row, col], self.is_mine[row, col],
+                              self.is_flagged[row, col], self.neighbor_mines[row, col])
+
+    def draw(self, screen, sprites):
+        """Draws the cells that changed since the last draw
 
         Args:
             screen (_attr_): Attribute of the Game class related to the screen
+            sprites (_dict_): Cell surfaces from build_cell_sprites
+
+        Returns:
+            list dirty_rects: Area of the screen that was redrawn, empty if nothing changed.
+            One rectangle around all the redrawn cells rather than one per cell
         """
-        for row in self.cells:
-            for cell in row:
-                cell.draw(screen)
+        return self.draw_board(self, screen, sprites)
 
     def reveal_all_mines(self):
         """Reveals all mines if the player loses
         """
-        for (r, c) in self.mine_locations:
-            self.cells[r][c].is_revealed = True
+        self.is_revealed |= self.is_mine
+        self.dirty_cells.update(np.flatnonzero(self.is_mine).tolist())
 
 class Game:
     def __init__(self):
@@ -182,121 +548,165 @@ class Game:
         """
         self.screen = pygame.display.set_mode((600, 700))
         pygame.display.set_caption("Minesweeper")
-        self.clock = pygame.time.Clock()
         self.running = True
+        self.dirty = True  # Whether the screen needs to be redrawn
+        self.redraw_all = True  # Whether the whole background has to be drawn first
         self.game_over = False
         self.won = False  # Track if the player has won
         self.start_time = None
-        self.timer_text = ""
+        self.last_elapsed = -1  # Seconds shown by the timer label
+        self.set_timer_text("")
         self.rows = 16
         self.cols = 16
         self.mines = 40
         self.board = Board(self.rows, self.cols, self.mines)
+        self.reset_rect = pygame.Rect(self.cols * CELL_SIZE - 100, 20, 80, 40)
         self.start_menu()
 
     def start_menu(self):
         """Defines anc creates the start menu
         """
         self.screen = pygame.display.set_mode((600, 700))
-        self.screen.fill(WHITE)
-        self.draw_text("Minesweeper", FONT, BLACK, self.screen, 230, 100)
-        self.draw_text("Rows: ", SMALL_FONT, BLACK, self.screen, 100, 250)
-        self.draw_text("Cols: ", SMALL_FONT, BLACK, self.screen, 100, 300)
-        self.draw_text("Mines: ", SMALL_FONT, BLACK, self.screen, 100, 350)
-        self.draw_text("Press Enter to start", SMALL_FONT, BLACK, self.screen, 200, 450)
+        pygame.time.set_timer(TIMER_EVENT, 0)  # No game timer while in the menu
 
         # Input boxes
         self.input_boxes = [pygame.Rect(200, 250, 100, 36), pygame.Rect(200, 300, 100, 36), pygame.Rect(200, 350, 100, 36)]
         self.input_text = ["16", "16", "40"]  # Default values
+        self.input_surfaces = [FONT.render(text, True, BLACK) for text in self.input_text]
         self.active_box = None  # Track which input box is active
 
-        pygame.display.flip()
+        # Everything but the input text is static, so it is drawn once
+        self.menu_bg = pygame.Surface((600, 700)).convert()
+        self.menu_bg.fill(WHITE)
+        self.draw_text("Minesweeper", FONT, BLACK, self.menu_bg, 230, 100)
+        self.draw_text("Rows: ", SMALL_FONT, BLACK, self.menu_bg, 100, 250)
+        self.draw_text("Cols: ", SMALL_FONT, BLACK, self.menu_bg, 100, 300)
+        self.draw_text("Mines: ", SMALL_FONT, BLACK, self.menu_bg, 100, 350)
+        self.draw_text("Press Enter to start", SMALL_FONT, BLACK, self.menu_bg, 200, 450)
+        for box in self.input_boxes:
+            pygame.draw.rect(self.menu_bg, DARK_GRAY, box, 2)
+
         self.menu_loop()
 
     def menu_loop(self):
-        """Handles operations in the menu
+        """Handles operations in the menu, sleeping until an event arrives and
+        only redrawing when the input text changed
 
         Raises:
             ValueError: An error if the number of mines is greater than the number of cels
         """
+        dirty = True
         while self.running:
-            for event in pygame.event.get():
-                if event.type == pygame.QUIT:
-                    self.running = False
-                if event.type == pygame.MOUSEBUTTONDOWN:
-                    # Check if an input box was clicked
-                    for i, box in enumerate(self.input_boxes):
-                        if box.collidepoint(event.pos):
-                            self.active_box = i
-                            break
-                if event.type == pygame.KEYDOWN:
-                    if self.active_box is not None:
-                        if event.key == pygame.K_RETURN:
-                            # Update rows, cols, and mines with the user input
-                            try:
-                                self.rows = int(self.input_text[0])
-                                self.cols = int(self.input_text[1])
-                                self.mines = int(self.input_text[2])
-                                if self.mines >= self.rows * self.cols:
-                                    raise ValueError("Too many mines")
-                                self.start_game()
-                                return
-                            except ValueError:
-                                print("Invalid input!")
-                        elif event.key == pygame.K_BACKSPACE:
-                            self.input_text[self.active_box] = self.input_text[self.active_box][:-1]
-                        elif event.unicode.isdigit():
-                            self.input_text[self.active_box] += event.unicode
-
-            self.screen.fill(WHITE)
-            self.draw_text("Minesweeper", FONT, BLACK, self.screen, 230, 100)
-            self.draw_text("Rows: ", SMALL_FONT, BLACK, self.screen, 100, 250)
-            self.draw_text("Cols: ", SMALL_FONT, BLACK, self.screen, 100, 300)
-            self.draw_text("Mines: ", SMALL_FONT, BLACK, self.screen, 100, 350)
-            self.draw_text("Press Enter to start", SMALL_FONT, BLACK, self.screen, 200, 450)
-
-            # Draw input boxes and current text
-            for i, box in enumerate(self.input_boxes):
-                pygame.draw.rect(self.screen, DARK_GRAY, box, 2)
-                text_surface = FONT.render(self.input_text[i], True, BLACK)
-                self.screen.blit(text_surface, (box.x + 5, box.y + 5))
-
-            pygame.display.flip()
+            if dirty:
+                self.screen.blit(self.menu_bg, (0, 0))
+                for box, text_surface in zip(self.input_boxes, self.input_surfaces):
+                    self.screen.blit(text_surface, (box.x + 5, box.y + 5))
+                pygame.display.flip()
+                dirty = False
+
+            event = pygame.event.wait()
+            if event.type == pygame.QUIT:
+                self.running = False
+            if event.type in (pygame.WINDOWEXPOSED, pygame.VIDEOEXPOSE):
+                dirty = True  # Draw the menu again once the window is uncovered
+            if event.type == pygame.MOUSEBUTTONDOWN:
+                # Check if an input box was clicked
+                for i, box in enumerate(self.input_boxes):
+                    if box.collidepoint(event.pos):
+                        self.active_box = i
+                        break
+            if event.type == pygame.KEYDOWN:
+                if self.active_box is not None:
+                    if event.key == pygame.K_RETURN:
+                        # Update rows, cols, and mines with the user input
+                        try:
+                            self.rows = int(self.input_text[0])
+                            self.cols = int(self.input_text[1])
+                            self.mines = int(self.input_text[2])
+                            if self.mines >= self.rows * self.cols:
+                                raise ValueError("Too many mines")
+                            self.start_game()
+                            return
+                        except ValueError:
+                            print("Invalid input!")
+                    elif event.key == pygame.K_BACKSPACE:
+                        self.input_text[self.active_box] = self.input_text[self.active_box][:-1]
+                        dirty = True
+                    elif event.unicode.isdigit():
+                        self.input_text[self.active_box] += event.unicode
+                        dirty = True
+                    if dirty:
+                        # Only the edited box needs its text rendered again
+                        self.input_surfaces[self.active_box] = FONT.render(self.input_text[self.active_box], True, BLACK)
 
     def start_game(self):
         """Begins each game
         """
         # Reset the board size and number of mines based on user input
         self.screen = pygame.display.set_mode((self.cols * CELL_SIZE, self.rows * CELL_SIZE + PANEL_HEIGHT))
+        self.cell_sprites = build_cell_sprites()
+        self.bg_surface = build_background(self.rows, self.cols)
+        self.redraw_all = True
+        self.reset_rect = pygame.Rect(self.cols * CELL_SIZE - 100, 20, 80, 40)
         self.board = Board(self.rows, self.cols, self.mines)
+        if self.board.use_jit and not jit_kernels:
+            # Compile while the player looks at the board rather than on the first click
+            threading.Thread(target=compile_jit_kernels, daemon=True).start()
         self.start_time = time.time()
-        self.timer_text = "Time: 0"
+        self.last_elapsed = 0
+        self.set_timer_text("Time: 0")
         self.game_over = False
         self.run()
 
     def run(self):
-        """Calls four functions that run the gameplay
+        """Runs the gameplay, sleeping until an event arrives and only
+        redrawing when something changed
         """
+        pygame.time.set_timer(TIMER_EVENT, 1000)
+        self.dirty = True
         while self.running:
-            self.handle_events()
-            self.update_timer()
-            self.draw()
-            self.clock.tick(FPS)
+            self.handle_event(pygame.event.wait())
+            self.handle_events()  # Anything queued up in the meantime
+            if self.dirty:
+                self.draw()
+                self.dirty = False
 
     def handle_events(self):
+        """Handles every pending event
+        """
         for event in pygame.event.get():
-            if event.type == pygame.QUIT:
-                self.running = False
-            elif event.type == pygame.MOUSEBUTTONDOWN and not self.game_over:
-                row, col = self.get_clicked_cell(event.pos)
-                if row is not None and col is not None:
-                    if event.button == 1:  # Left click
-                        if self.board.first_click:
-                            self.board.place_mines(row, col)
-                            self.board.first_click = False
-                        self.handle_left_click(row, col)
-                    elif event.button == 3:  # Right click
-                        self.handle_right_click(row, col)
+            self.handle_event(event)
+
+    def handle_event(self, event):
+        """Handles a single event
+
+        Args:
+            event (_pygame.event.Event_): Event to handle
+        """
+        if event.type == pygame.QUIT:
+            self.running = False
+        elif event.type == TIMER_EVENT:
+            self.update_timer()
+        elif event.type in (pygame.WINDOWEXPOSED, pygame.VIDEOEXPOSE):
+            # Only changed areas are pushed on draw, so push the whole screen
+            # surface again once the window is uncovered
+            pygame.display.flip()
+        elif event.type == pygame.MOUSEBUTTONDOWN:
+            if event.button == 1 and self.reset_rect.collidepoint(event.pos):
+                self.start_menu()  # Reset the game to start menu
+                return
+            if self.game_over:
+                return
+            row, col = self.get_clicked_cell(event.pos)
+            if row is not None and col is not None:
+                self.dirty = True
+                if event.button == 1:  # Left click
+                    if self.board.first_click:
+                        self.board.place_mines(row, col)
+                        self.board.first_click = False
+                    self.handle_left_click(row, col)
+                elif event.button == 3:  # Right click
+                    self.handle_right_click(row, col)
 
     def get_clicked_cell(self, pos):
         x, y = pos
@@ -313,8 +723,7 @@ class Game:
             row (_int_): Row of cell
             col (_int_): Column of cell
         """
-        cell = self.board.cells[row][col]
-        if cell.reveal(self.board):  # Mine clicked
+        if self.board.reveal(row, col):  # Mine clicked
             self.board.reveal_all_mines()
             self.game_over = True
             self.won = False  # Game lost
@@ -329,41 +738,51 @@ class Game:
             row (_int_): Row of cell
             col (_int_): Column of cell
         """
-        cell = self.board.cells[row][col]
-        cell.toggle_flag()
+        self.board.toggle_flag(row, col)
 
     def update_timer(self):
         """Runs the timer
         """
         if not self.game_over and not self.board.first_click:
             elapsed_time = int(time.time() - self.start_time)
-            self.timer_text = f"Time: {elapsed_time}"
+            if elapsed_time != self.last_elapsed:
+                self.set_timer_text(f"Time: {elapsed_time}")
+                self.last_elapsed = elapsed_time
+
+    def set_timer_text(self, text):
+        """Sets the timer text and renders its label once, to be reused until it changes
+
+        Args:
+            text (_string_): Text of the timer
+        """
+        self.timer_text = text
+        self.timer_surface = SMALL_FONT.render(text, True, BLACK).convert_alpha()
+        self.dirty = True
 
     def draw(self):
-        """Draws the game
+        """Draws the game, only pushing the changed areas to the display
         """
-        self.screen.fill(WHITE)
-        self.board.draw(self.screen)
+        dirty_rects = []
+        if self.redraw_all:
+            self.screen.blit(self.bg_surface, (0, 0))
+            dirty_rects.append(self.screen.get_rect())
+            self.redraw_all = False
+        dirty_rects += self.board.draw(self.screen, self.cell_sprites)
         self.draw_panel()
-        pygame.display.flip()
+        dirty_rects.append(pygame.Rect(0, 0, self.cols * CELL_SIZE, PANEL_HEIGHT))
+        pygame.display.update(dirty_rects)
 
     def draw_panel(self):
         """Draws the game panel
         """
         pygame.draw.rect(self.screen, GRAY, (0, 0, self.cols * CELL_SIZE, PANEL_HEIGHT))
-        timer_label = SMALL_FONT.render(self.timer_text, True, BLACK)
-        self.screen.blit(timer_label, (10, 10))
+        self.screen.blit(self.timer_surface, (10, 10))
 
-        # Reset button
-        reset_button_rect = pygame.Rect(self.cols * CELL_SIZE - 100, 20, 80, 40)
-        pygame.draw.rect(self.screen, RESET_BUTTON_COLOR, reset_button_rect)
+        # Reset button, clicks on it are handled in handle_event
+        pygame.draw.rect(self.screen, RESET_BUTTON_COLOR, self.reset_rect)
         reset_text = SMALL_FONT.render("Reset", True, WHITE)
         self.screen.blit(reset_text, (self.cols * CELL_SIZE - 90, 30))
 
-        if pygame.mouse.get_pressed()[0]:  # Left click
-            if reset_button_rect.collidepoint(pygame.mouse.get_pos()):
-                self.start_menu()  # Reset the game to start menu
-
         # Display win/lose message
         if self.game_over:
             if self.won:
@@ -391,12 +810,7 @@ class Game:
 
     def check_win(self):
         """Check if all non-mine cells are revealed."""
-        for row in range(self.rows):
-            for col in range(self.cols):
-                cell = self.board.cells[row][col]
-                if not cell.is_mine and not cell.is_revealed:
-                    return False
-        return True
+        return self.board.unrevealed_safe == 0
 
 
 if __name__ == "__main__":
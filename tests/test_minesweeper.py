@@ -2,12 +2,13 @@ import pytest
 import pygame
 import unittest
 from unittest.mock import patch, Mock
-from minesweeper.minesweeper_gameplay import Cell, Game, Board
+from minesweeper.minesweeper_gameplay import (Game, Board, TIMER_EVENT, REVEALED_STATES, JIT_AVAILABLE,
+                                              build_cell_sprites, compile_jit_kernels, jit_kernels)
 
 class TestCell(unittest.TestCase):
     def setUp(self):
-        self.cell = Cell(row=0, col=0)
-        self.board = Mock(spec=Board)  # Mock board to test reveal without setting up a full board
+        self.board = Board(3, 3, 1)
+        self.cell = self.board.cell(0, 0)
 
     def test_cell_initial_state(self):
         self.assertFalse(self.cell.is_mine)
@@ -21,14 +22,21 @@ class TestCell(unittest.TestCase):
         self.cell.toggle_flag()
         self.assertFalse(self.cell.is_flagged)
 
+    def test_cell_view_is_read_only(self):
+        # Writes have to go through the board to keep unrevealed_safe right
+        with self.assertRaises(AttributeError):
+            self.cell.is_revealed = True
+        with self.assertRaises(AttributeError):
+            self.cell.is_mine = True
+
     def test_reveal_mine_cell(self):
-        self.cell.is_mine = True
-        result = self.cell.reveal(self.board)
+        self.board.is_mine[0, 0] = 1
+        result = self.cell.reveal()
         self.assertTrue(result)  # Revealing a mine returns True for game over
 
     def test_reveal_safe_cell(self):
-        self.cell.neighbor_mines = 1
-        result = self.cell.reveal(self.board)
+        self.board.neighbor_mines[0, 0] = 1
+        result = self.cell.reveal()
         self.assertFalse(result)  # Revealing a safe cell returns False for game over
         self.assertTrue(self.cell.is_revealed)
 
@@ -46,21 +54,137 @@ class TestBoard(unittest.TestCase):
         for r, c in self.board.mine_locations:
             self.assertNotIn((r, c), [(exclude_row, exclude_col), (exclude_row + 1, exclude_col), (exclude_row, exclude_col + 1)])
 
+    def test_place_mines_without_mines(self):
+        board = Board(3, 3, 0)
+        board.place_mines(1, 1)
+        self.assertEqual(board.mine_locations, [])
+        self.assertEqual(int(board.is_mine.sum()), 0)
+
+    def test_place_mines_dense_board(self):
+        board = Board(4, 4, 7)
+        board.place_mines(1, 1)
+        self.assertEqual(len(set(board.mine_locations)), 7)
+        self.assertEqual(int(board.is_mine.sum()), 7)
+        self.assertEqual(int(board.is_mine[0:3, 0:3].sum()), 0)
+
+    def test_place_mines_sparse_board(self):
+        board = Board(20, 20, 10)
+        board.place_mines(19, 19)
+        self.assertEqual(len(set(board.mine_locations)), 10)
+        self.assertEqual(int(board.is_mine.sum()), 10)
+        self.assertEqual(int(board.is_mine[18:, 18:].sum()), 0)
+
     def test_count_mines_around(self):
-        self.board.cells[1][1].is_mine = True
+        self.board.is_mine[1, 1] = 1
         count = self.board.count_mines_around(0, 0)
         self.assertEqual(count, 1)
 
     def test_calculate_neighbor_mines(self):
-        self.board.cells[0][0].is_mine = True
+        self.board.is_mine[0, 0] = 1
+        self.board.calculate_neighbor_mines()
+        self.assertEqual(self.board.cell(0, 1).neighbor_mines, 1)
+        self.assertEqual(self.board.neighbor_mines[0, 0], 0)
+
+    def test_cell_state(self):
+        self.assertEqual(self.board.cell_state(0, 0), "hidden")
+        self.board.toggle_flag(0, 0)
+        self.assertEqual(self.board.cell_state(0, 0), "flag")
+        self.board.is_mine[1, 1] = 1
+        self.board.calculate_neighbor_mines()
+        self.board.reveal(0, 1)
+        self.assertEqual(self.board.cell_state(0, 1), "revealed_1")
+        self.board.reveal(1, 1)
+        self.assertEqual(self.board.cell_state(1, 1), "mine")
+
+    def test_draw_clears_dirty_cells(self):
+        pygame.display.init()
+        screen = pygame.display.set_mode((self.cols * 30, self.rows * 30 + 100))
+        sprites = build_cell_sprites()
+        self.assertEqual(self.board.draw(screen, sprites), [])
+        self.board.toggle_flag(1, 2)
+        self.assertEqual(self.board.dirty_cells, {1 * self.cols + 2})
+        self.assertEqual(self.board.draw(screen, sprites), [pygame.Rect(60, 130, 30, 30)])
+        pygame.display.quit()
+
+    def test_jit_board_falls_back_until_compiled(self):
+        board = Board(50, 50, 1)
+        board.use_jit = True
+        with patch.dict(jit_kernels, clear=True):
+            board.is_mine[0, 0] = 1
+            board.calculate_neighbor_mines()
+            board.reveal(49, 49)
+        self.assertEqual(board.unrevealed_safe, 0)
+
+    def assert_paths_match(self, rows, cols, attribute, value):
+        # Plays the same moves on two boards, the second with attribute set to value
+        boards = [Board(rows, cols, 3), Board(rows, cols, 3)]
+        setattr(boards[1], attribute, value)
+        for board in boards:
+            board.is_mine[[0, rows // 2, rows - 1], [cols - 1, cols // 2, 0]] = 1
+            board.calculate_neighbor_mines()
+            board.toggle_flag(rows - 2, 1)
+            board.dirty_cells.clear()
+            board.reveal(0, 0)
+        self.assertTrue((boards[0].neighbor_mines == boards[1].neighbor_mines).all())
+        self.assertTrue((boards[0].is_revealed == boards[1].is_revealed).all())
+        self.assertEqual(boards[0].dirty_cells, boards[1].dirty_cells)
+        self.assertEqual(boards[0].unrevealed_safe, boards[1].unrevealed_safe)
+
+    @unittest.skipUnless(JIT_AVAILABLE, "numba is not installed")
+    def test_jit_path_matches_python_path(self):
+        compile_jit_kernels()
+        self.assert_paths_match(12, 15, 'use_jit', True)
+
+    def test_bitboard_counts_match_array_counts(self):
+        # 8x8 is the largest board using the bitboard
+        self.assertTrue(Board(8, 8, 10).use_bitboard)
+        self.assertFalse(Board(8, 9, 10).use_bitboard)
+        self.assert_paths_match(8, 8, 'use_bitboard', False)
+        self.assert_paths_match(7, 9, 'use_bitboard', False)
+
+    def test_reveal_all_mines(self):
+        self.board.place_mines(0, 0)
+        self.board.reveal_all_mines()
+        self.assertTrue((self.board.is_revealed == self.board.is_mine).all())
+        self.assertEqual(self.board.dirty_cells, {r * self.cols + c for (r, c) in self.board.mine_locations})
+
+    def test_generated_drawer_matches_cell_state(self):
+        board = Board(6, 7, 8)
+        board.place_mines(2, 3)
+        board.reveal(2, 3)
+        board.toggle_flag(0, 0)
+        board.toggle_flag(5, 6)
+        board.reveal_all_mines()
+        board.dirty_cells = set(range(6 * 7))
+        # Sprites mapped to their own keys, so the blits show which state was picked
+        sprites = {state: state for state in ("hidden", "flag", "mine", *REVEALED_STATES)}
+        screen = Mock()
+        board.draw(screen, sprites)
+        blit_sequence = screen.blits.call_args[0][0]
+        self.assertEqual(len(blit_sequence), 6 * 7)
+        for state, (x, y) in blit_sequence:
+            row, col = (y - 100) // 30, x // 30
+            self.assertEqual(state, board.cell_state(row, col))
+
+    def test_flood_reveal_stops_at_numbered_cells(self):
+        self.board.is_mine[2, 2] = 1
         self.board.calculate_neighbor_mines()
-        self.assertEqual(self.board.cells[0][1].neighbor_mines, 1)
+        self.board.flood_reveal(0, 0)
+        for r in range(self.rows):
+            for c in range(self.cols):
+                self.assertEqual(self.board.cell(r, c).is_revealed, (r, c) != (2, 2))
+        self.assertEqual(self.board.unrevealed_safe, 0)
 
 
 class TestGame(unittest.TestCase):
     def setUp(self):
         pygame.display.init()  # Initialize Pygame display
         self.screen = pygame.display.set_mode((600, 700))  # Set up display mode for testing
+        # The menu blocks waiting for input, so skip it when creating the game
+        self.menu_loop = Game.menu_loop
+        menu_loop_patcher = patch.object(Game, 'menu_loop')
+        menu_loop_patcher.start()
+        self.addCleanup(menu_loop_patcher.stop)
         self.game = Game()  # Initialize the Game instance
 
     def tearDown(self):
@@ -72,7 +196,7 @@ class TestGame(unittest.TestCase):
         self.assertFalse(self.game.won)
 
     def test_start_game_resets_game_state(self):
-        with patch('time.time', return_value=1000):  # Mock time for a consistent start time
+        with patch('time.time', return_value=1000), patch.object(Game, 'run'):  # Mock time for a consistent start time
             self.game.start_game()
             self.assertEqual(self.game.start_time, 1000)
             self.assertFalse(self.game.game_over)
@@ -84,6 +208,45 @@ class TestGame(unittest.TestCase):
         self.game.handle_events()
         self.assertFalse(self.game.running)
 
+    def test_timer_event_marks_screen_dirty(self):
+        self.game.start_time = 1000
+        self.game.board.first_click = False
+        self.game.dirty = False
+        with patch('time.time', return_value=1005):
+            self.game.handle_event(pygame.event.Event(TIMER_EVENT))
+        self.assertEqual(self.game.timer_text, "Time: 5")
+        self.assertTrue(self.game.dirty)
+
+    def test_timer_label_rendered_once_per_second(self):
+        self.game.start_time = 1000
+        self.game.board.first_click = False
+        with patch('time.time', return_value=1005.2):
+            self.game.update_timer()
+        label = self.game.timer_surface
+        self.game.dirty = False
+        with patch('time.time', return_value=1005.8):
+            self.game.update_timer()
+        self.assertIs(self.game.timer_surface, label)
+        self.assertFalse(self.game.dirty)
+
+    def test_expose_event_repaints_display(self):
+        with patch('pygame.display.flip') as mock_flip:
+            self.game.handle_event(pygame.event.Event(pygame.WINDOWEXPOSED))
+        mock_flip.assert_called_once()
+
+    def test_expose_event_redraws_menu(self):
+        pygame.event.clear()
+        pygame.event.post(pygame.event.Event(pygame.WINDOWEXPOSED))
+        pygame.event.post(pygame.event.Event(pygame.QUIT))
+        with patch('pygame.display.flip') as mock_flip:
+            self.menu_loop(self.game)
+        self.assertEqual(mock_flip.call_count, 2)  # First draw, then again after the expose
+
+    def test_reset_button_click_opens_menu(self):
+        with patch.object(self.game, 'start_menu') as mock_start_menu:
+            self.game.handle_event(pygame.event.Event(pygame.MOUSEBUTTONDOWN, pos=self.game.reset_rect.center, button=1))
+        mock_start_menu.assert_called_once()
+
     def test_get_clicked_cell_outside_panel(self):
         # Y-coordinate above the panel should return (None, None)
         row, col = self.game.get_clicked_cell((50, 50))
@@ -93,12 +256,31 @@ class TestGame(unittest.TestCase):
     def test_check_win_condition(self):
         # Set up a 2x2 board with 1 mine for testing
         self.game.board = Board(2, 2, 1)
-        self.game.board.cells[0][0].is_mine = True
-        self.game.board.cells[0][1].is_revealed = True
-        self.game.board.cells[1][0].is_revealed = True
-        self.game.board.cells[1][1].is_revealed = True
+        self.game.board.is_mine[0, 0] = 1
+        self.game.board.calculate_neighbor_mines()
+        self.game.board.reveal(0, 1)
+        self.game.board.reveal(1, 0)
+        self.assertFalse(self.game.check_win())
+        self.game.board.reveal(1, 1)
         self.assertTrue(self.game.check_win())
 
+    def test_draw_pushes_background_then_changed_cells(self):
+        self.game.rows, self.game.cols, self.game.mines = 5, 6, 3
+        with patch.object(Game, 'run'):
+            self.game.start_game()
+        with patch('pygame.display.update') as mock_update:
+            self.game.draw()
+            self.assertIn(self.game.screen.get_rect(), mock_update.call_args[0][0])
+            self.assertFalse(self.game.redraw_all)
+            self.game.board.toggle_flag(2, 3)
+            self.game.draw()
+            # Only the flagged cell and the panel
+            self.assertEqual(mock_update.call_args[0][0], [pygame.Rect(90, 160, 30, 30), pygame.Rect(0, 0, 180, 100)])
+        # Cells that were never drawn rely on the background looking like a hidden cell
+        hidden = self.game.cell_sprites["hidden"]
+        untouched = self.game.bg_surface.subsurface(pygame.Rect(0, 220, 30, 30))
+        self.assertEqual(pygame.image.tobytes(untouched, "RGB"), pygame.image.tobytes(hidden, "RGB"))
+
     def test_draw_panel(self):
         # This test checks if draw_panel runs without errors
         try: